@@ -16,6 +16,31 @@ DB_CONFIG = {
     'database': os.getenv('DB_NAME', 'library_management')
 }
 
+# Branch shards: BRANCHES is a comma-separated list of branch names. Each
+# branch may override its connection with DB_<BRANCH>_HOST/USER/PASSWORD/NAME;
+# unset values fall back to DB_CONFIG, with the database named <DB_NAME>_<branch>.
+BRANCHES = [b.strip() for b in os.getenv('BRANCHES', '').split(',') if b.strip()]
+DEFAULT_BRANCH = os.getenv('DEFAULT_BRANCH', BRANCHES[0] if BRANCHES else 'main')
+
+def _shard_config(branch):
+    """Build the connection settings for a branch shard."""
+    prefix = f"DB_{branch.upper()}_"
+    return {
+        'host': os.getenv(prefix + 'HOST', DB_CONFIG['host']),
+        'user': os.getenv(prefix + 'USER', DB_CONFIG['user']),
+        'password': os.getenv(prefix + 'PASSWORD', DB_CONFIG['password']),
+        'database': os.getenv(prefix + 'NAME', f"{DB_CONFIG['database']}_{branch}")
+    }
+
+def build_shard_configs(branches, default_branch):
+    """Map each branch to its connection settings.
+
+    Without branches the whole library lives in the single DB_CONFIG database.
+    """
+    return {branch: _shard_config(branch) for branch in branches} or {default_branch: DB_CONFIG}
+
+SHARD_CONFIGS = build_shard_configs(BRANCHES, DEFAULT_BRANCH)
+
 # Application settings
 APP_NAME = "Library Management System"
 VERSION = "1.0.0"
@@ -4,11 +4,12 @@ Database operations for the Library Management System.
 
 import mysql.connector
 from mysql.connector import Error
-from config import DB_CONFIG
+from config import DB_CONFIG, SHARD_CONFIGS, DEFAULT_BRANCH
 
 class Database:
-    def __init__(self):
+    def __init__(self, config=None):
         """Initialize database connection."""
+        self.config = config or DB_CONFIG
         self.connection = None
         self.cursor = None
         self.connect()
@@ -16,7 +17,7 @@ class Database:
     def connect(self):
         """Establish database connection."""
         try:
-            self.connection = mysql.connector.connect(**DB_CONFIG)
+            self.connection = mysql.connector.connect(**self.config)
             self.cursor = self.connection.cursor()
             print("Successfully connected to the database.")
         except Error as e:
@@ -133,4 +134,142 @@ class Database:
         ]
 
         for query in queries:
-            self.execute_query(query) 
\ No newline at end of file
+            self.execute_query(query)
+
+
+class ShardError(Exception):
+    """Raised when one or more branch shards could not be queried."""
+    pass
+
+class ShardRouter:
+    """Route queries to per-branch database shards.
+
+    Branch-local tables (book_copies, transactions) live only on their branch's
+    shard. Shared tables (categories, books, membership, librarians) are
+    replicated to every shard so local joins and foreign keys keep working;
+    the default branch's shard acts as the catalog primary.
+    """
+
+    def __init__(self, shard_configs=None, default_branch=None):
+        """Open a connection to every configured shard."""
+        shard_configs = shard_configs or SHARD_CONFIGS
+        default_branch = default_branch or DEFAULT_BRANCH
+        if default_branch not in shard_configs:
+            raise ValueError(
+                f"Default branch '{default_branch}' is not one of the configured "
+                f"branches: {', '.join(shard_configs)}"
+            )
+        self.default_branch = default_branch
+        self.shards = {branch: Database(config) for branch, config in shard_configs.items()}
+
+    def branches(self):
+        """Return the names of all configured branches."""
+        return list(self.shards)
+
+    def for_branch(self, branch=None):
+        """Return the shard for a branch.
+
+        The branch may only be omitted when a single shard is configured,
+        since copy and transaction ids are not unique across branches.
+        """
+        if branch is None:
+            if len(self.shards) > 1:
+                raise ValueError(
+                    f"A branch is required when several are configured: {', '.join(self.shards)}"
+                )
+            branch = self.default_branch
+        if branch not in self.shards:
+            raise ValueError(f"Unknown branch: {branch}")
+        return self.shards[branch]
+
+    def catalog(self):
+        """Return the shard that owns the primary copy of the shared tables."""
+        return self.shards[self.default_branch]
+
+    def replicate_insert(self, table, key_column, columns, params):
+        """Insert a shared row on the catalog shard and copy it to every other shard.
+
+        The row keeps the id assigned by the catalog shard on every replica.
+        Returns that id, or None if any shard rejected the row. On a failed
+        replica the row is deleted again from every shard already written.
+        """
+        column_list = ", ".join(columns)
+        placeholders = ", ".join(["%s"] * len(columns))
+        catalog = self.catalog()
+
+        query = f"INSERT INTO {table} ({column_list}) VALUES ({placeholders})"
+        if not catalog.execute_query(query, params):
+            return None
+        row_id = catalog.cursor.lastrowid
+        written = [self.default_branch]
+
+        replica_query = f"INSERT INTO {table} ({key_column}, {column_list}) VALUES (%s, {placeholders})"
+        for branch, db in self.shards.items():
+            if db is catalog:
+                continue
+            if not db.execute_query(replica_query, (row_id,) + tuple(params)):
+                print(f"Error replicating {table} row {row_id} to branch '{branch}'.")
+                self._undo_insert(table, key_column, row_id, written)
+                return None
+            written.append(branch)
+        return row_id
+
+    def _undo_insert(self, table, key_column, row_id, branches):
+        """Delete a partially replicated row and report shards left out of sync."""
+        query = f"DELETE FROM {table} WHERE {key_column} = %s"
+        out_of_sync = [branch for branch in branches
+                       if not self.shards[branch].execute_query(query, (row_id,))]
+        if out_of_sync:
+            print(f"Warning: {table} row {row_id} is out of sync on branch(es): "
+                  f"{', '.join(out_of_sync)}")
+        return out_of_sync
+
+    def scatter_gather(self, query, params=None):
+        """Run a query on every shard and return the rows prefixed with their branch.
+
+        Raises ShardError naming every shard that could not be read, so a
+        broken shard is never mistaken for one with no rows.
+        """
+        results = []
+        failed = []
+        for branch in self.shards:
+            try:
+                rows = self._read(branch, query, params)
+            except ShardError:
+                failed.append(branch)
+                continue
+            for row in rows:
+                results.append((branch,) + tuple(row))
+        if failed:
+            raise ShardError(f"Could not read from branch(es): {', '.join(failed)}")
+        return results
+
+    def fetch_catalog(self, query, params=None):
+        """Fetch all rows for a query on the catalog shard.
+
+        Raises ShardError if the catalog shard could not be read.
+        """
+        return self._read(self.default_branch, query, params)
+
+    def _read(self, branch, query, params=None):
+        """Fetch all rows from one shard, raising ShardError on failure."""
+        db = self.shards[branch]
+        try:
+            if params:
+                db.cursor.execute(query, params)
+            else:
+                db.cursor.execute(query)
+            return db.cursor.fetchall()
+        except Error as e:
+            print(f"Error fetching data from branch '{branch}': {e}")
+            raise ShardError(f"Could not read from branch(es): {branch}") from e
+
+    def create_tables(self):
+        """Create all necessary database tables on every shard."""
+        for db in self.shards.values():
+            db.create_tables()
+
+    def disconnect(self):
+        """Close every shard connection."""
+        for db in self.shards.values():
+            db.disconnect()
@@ -2,7 +2,7 @@
 Main entry point for the Library Management System.
 """
 
-from database import Database
+from database import ShardRouter
 from services import LibraryService
 from config import APP_NAME, VERSION
 
@@ -25,7 +25,8 @@ def display_book_menu():
     print("2. Add Book Copy")
     print("3. View All Books")
     print("4. Search Books")
-    print("5. Back to Main Menu")
+    print("5. Add Category")
+    print("6. Back to Main Menu")
     print("=" * 30)
 
 def display_member_menu():
@@ -35,7 +36,8 @@ def display_member_menu():
     print("1. Register New Member")
     print("2. View All Members")
     print("3. Search Members")
-    print("4. Back to Main Menu")
+    print("4. Add Librarian")
+    print("5. Back to Main Menu")
     print("=" * 30)
 
 def display_transaction_menu():
@@ -59,13 +61,28 @@ def display_report_menu():
     print("4. Back to Main Menu")
     print("=" * 30)
 
+def prompt_branch(library_service):
+    """Ask for the branch to work on when more than one is configured.
+
+    Copy and transaction ids are only unique within a branch, so there is no
+    default: the operator must name a configured branch.
+    """
+    branches = library_service.router.branches()
+    if len(branches) == 1:
+        return None
+    while True:
+        branch = input(f"Enter branch ({', '.join(branches)}): ").strip()
+        if branch in branches:
+            return branch
+        print("Invalid branch. Please try again.")
+
 def main():
     """Main entry point of the application."""
     try:
-        # Initialize database and service
-        db = Database()
-        db.create_tables()
-        library_service = LibraryService()
+        # Initialize branch shards and service
+        router = ShardRouter()
+        router.create_tables()
+        library_service = LibraryService(router)
 
         while True:
             display_menu()
@@ -74,7 +91,7 @@ def main():
             if choice == '1':
                 while True:
                     display_book_menu()
-                    book_choice = input("\nEnter your choice (1-5): ")
+                    book_choice = input("\nEnter your choice (1-6): ")
                     
                     if book_choice == '1':
                         # Add new book
@@ -89,7 +106,8 @@ def main():
                         # Add book copy
                         book_id = int(input("Enter book ID: "))
                         condition = input("Enter book condition: ")
-                        library_service.add_book_copy(book_id, condition)
+                        branch = prompt_branch(library_service)
+                        library_service.add_book_copy(book_id, condition, branch)
                     
                     elif book_choice == '3':
                         # View all books
@@ -100,12 +118,17 @@ def main():
                         print("Search functionality coming soon...")
                     
                     elif book_choice == '5':
+                        # Add category
+                        category_name = input("Enter category name: ")
+                        library_service.add_category(category_name)
+                    
+                    elif book_choice == '6':
                         break
 
             elif choice == '2':
                 while True:
                     display_member_menu()
-                    member_choice = input("\nEnter your choice (1-4): ")
+                    member_choice = input("\nEnter your choice (1-5): ")
                     
                     if member_choice == '1':
                         # Register new member
@@ -124,6 +147,13 @@ def main():
                         print("Search functionality coming soon...")
                     
                     elif member_choice == '4':
+                        # Add librarian
+                        name = input("Enter librarian name: ")
+                        email = input("Enter email: ")
+                        hire_date = input("Enter hire date (YYYY-MM-DD): ")
+                        library_service.add_librarian(name, email, hire_date)
+                    
+                    elif member_choice == '5':
                         break
 
             elif choice == '3':
@@ -136,13 +166,15 @@ def main():
                         user_id = int(input("Enter user ID: "))
                         copy_id = int(input("Enter book copy ID: "))
                         librarian_id = int(input("Enter librarian ID: "))
-                        library_service.borrow_book(user_id, copy_id, librarian_id)
+                        branch = prompt_branch(library_service)
+                        library_service.borrow_book(user_id, copy_id, librarian_id, branch)
                     
                     elif trans_choice == '2':
                         # Return book
                         transaction_id = int(input("Enter transaction ID: "))
                         librarian_id = int(input("Enter librarian ID: "))
-                        library_service.return_book(transaction_id, librarian_id)
+                        branch = prompt_branch(library_service)
+                        library_service.return_book(transaction_id, librarian_id, branch)
                     
                     elif trans_choice == '3':
                         # View active transactions (to be implemented)
@@ -185,7 +217,7 @@ def main():
     except Exception as e:
         print(f"\nAn error occurred: {e}")
     finally:
-        db.disconnect()
+        router.disconnect()
 
 if __name__ == "__main__":
     main()
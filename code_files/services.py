@@ -4,13 +4,34 @@ Business logic and operations for the Library Management System.
 
 from datetime import datetime, timedelta
 from prettytable import PrettyTable
-from database import Database
+from database import ShardRouter, ShardError
 from models import Book, Member, Transaction, Librarian, ValidationError
 
 class LibraryService:
-    def __init__(self):
-        """Initialize library service with database connection."""
-        self.db = Database()
+    def __init__(self, router=None):
+        """Initialize library service with its branch shards."""
+        self.router = router or ShardRouter()
+        self.db = self.router.catalog()
+
+    def add_category(self, category_name):
+        """Add a new book category to the shared catalog."""
+        try:
+            if not category_name or not category_name.strip():
+                raise ValidationError("Category name cannot be empty")
+
+            category_id = self.router.replicate_insert(
+                'categories', 'category_id', ('category_name',), (category_name.strip(),)
+            )
+            if category_id is not None:
+                print("Category added successfully.")
+                return True
+            return False
+        except ValidationError as e:
+            print(f"Validation error: {e}")
+            return False
+        except Exception as e:
+            print(f"Error adding category: {e}")
+            return False
 
     def add_book(self, title, isbn, publish_year, category_id, author):
         """Add a new book to the library."""
@@ -20,14 +41,11 @@ class LibraryService:
             isbn = Book.validate_isbn(isbn)
             publish_year = Book.validate_publish_year(publish_year)
 
-            # Insert book
-            query = """
-                INSERT INTO books (title, isbn, publish_year, category_id, author)
-                VALUES (%s, %s, %s, %s, %s)
-            """
+            # Insert book into the shared catalog
+            columns = ('title', 'isbn', 'publish_year', 'category_id', 'author')
             params = (title, isbn, publish_year, category_id, author)
             
-            if self.db.execute_query(query, params):
+            if self.router.replicate_insert('books', 'book_id', columns, params) is not None:
                 print("Book added successfully.")
                 return True
             return False
@@ -38,16 +56,18 @@ class LibraryService:
             print(f"Error adding book: {e}")
             return False
 
-    def add_book_copy(self, book_id, condition_description):
-        """Add a new copy of an existing book."""
+    def add_book_copy(self, book_id, condition_description, branch=None):
+        """Add a new copy of an existing book to a branch."""
         try:
+            db = self.router.for_branch(branch)
+
             query = """
                 INSERT INTO book_copies (book_id, condition_description)
                 VALUES (%s, %s)
             """
             params = (book_id, condition_description)
             
-            if self.db.execute_query(query, params):
+            if db.execute_query(query, params):
                 print("Book copy added successfully.")
                 return True
             return False
@@ -68,13 +88,10 @@ class LibraryService:
             join_date = datetime.now()
             expire_date = join_date + timedelta(days=365)
 
-            query = """
-                INSERT INTO membership (name, email, phone, address, join_date, expire_date)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
+            columns = ('name', 'email', 'phone', 'address', 'join_date', 'expire_date')
             params = (name, email, phone, address, join_date, expire_date)
             
-            if self.db.execute_query(query, params):
+            if self.router.replicate_insert('membership', 'user_id', columns, params) is not None:
                 print("Member registered successfully.")
                 return True
             return False
@@ -85,11 +102,35 @@ class LibraryService:
             print(f"Error registering member: {e}")
             return False
 
-    def borrow_book(self, user_id, copy_id, librarian_id):
-        """Process a book borrowing transaction."""
+    def add_librarian(self, name, email, hire_date):
+        """Add a new librarian, shared by every branch."""
         try:
+            # Validate librarian data
+            name = Librarian.validate_name(name)
+            email = Librarian.validate_email(email)
+            hire_date = Librarian.validate_hire_date(hire_date)
+
+            columns = ('name', 'email', 'hire_date')
+            params = (name, email, hire_date)
+
+            if self.router.replicate_insert('librarians', 'librarian_id', columns, params) is not None:
+                print("Librarian added successfully.")
+                return True
+            return False
+        except ValidationError as e:
+            print(f"Validation error: {e}")
+            return False
+        except Exception as e:
+            print(f"Error adding librarian: {e}")
+            return False
+
+    def borrow_book(self, user_id, copy_id, librarian_id, branch=None):
+        """Process a book borrowing transaction at a branch."""
+        try:
+            db = self.router.for_branch(branch)
+
             # Check if book is available
-            if not self.is_book_available(copy_id):
+            if not self.is_book_available(copy_id, branch):
                 print("Book is not available for borrowing.")
                 return False
 
@@ -108,9 +149,9 @@ class LibraryService:
             """
             params = (user_id, copy_id, librarian_id, borrow_date, due_date)
             
-            if self.db.execute_query(query, params):
+            if db.execute_query(query, params):
                 # Update book availability
-                self.update_book_availability(copy_id, 'no')
+                self.update_book_availability(copy_id, 'no', branch)
                 print("Book borrowed successfully.")
                 return True
             return False
@@ -118,12 +159,14 @@ class LibraryService:
             print(f"Error borrowing book: {e}")
             return False
 
-    def return_book(self, transaction_id, librarian_id):
-        """Process a book return transaction."""
+    def return_book(self, transaction_id, librarian_id, branch=None):
+        """Process a book return transaction at a branch."""
         try:
+            db = self.router.for_branch(branch)
+
             # Get transaction details
             query = "SELECT copy_id FROM transactions WHERE transaction_id = %s"
-            result = self.db.fetch_one(query, (transaction_id,))
+            result = db.fetch_one(query, (transaction_id,))
             if not result:
                 print("Transaction not found.")
                 return False
@@ -139,9 +182,9 @@ class LibraryService:
             """
             params = (return_date, librarian_id, transaction_id)
             
-            if self.db.execute_query(query, params):
+            if db.execute_query(query, params):
                 # Update book availability
-                self.update_book_availability(copy_id, 'yes')
+                self.update_book_availability(copy_id, 'yes', branch)
                 print("Book returned successfully.")
                 return True
             return False
@@ -149,46 +192,68 @@ class LibraryService:
             print(f"Error returning book: {e}")
             return False
 
-    def is_book_available(self, copy_id):
-        """Check if a book copy is available."""
+    def is_book_available(self, copy_id, branch=None):
+        """Check if a book copy is available at a branch."""
         query = "SELECT available FROM book_copies WHERE copy_id = %s"
-        result = self.db.fetch_one(query, (copy_id,))
+        result = self.router.for_branch(branch).fetch_one(query, (copy_id,))
         return result and result[0] == 'yes'
 
     def can_user_borrow(self, user_id):
-        """Check if a user can borrow more books."""
+        """Check if a user can borrow more books across all branches.
+
+        Raises ShardError if any branch could not be read.
+        """
         query = """
             SELECT COUNT(*) FROM transactions 
             WHERE user_id = %s AND return_date IS NULL
         """
-        result = self.db.fetch_one(query, (user_id,))
-        return result and result[0] < 3  # Maximum 3 books per user
+        results = self.router.scatter_gather(query, (user_id,))
+        active_loans = sum(row[1] for row in results)
+        return active_loans < 3  # Maximum 3 books per user
 
-    def update_book_availability(self, copy_id, status):
-        """Update book copy availability status."""
+    def update_book_availability(self, copy_id, status, branch=None):
+        """Update book copy availability status at a branch."""
         query = "UPDATE book_copies SET available = %s WHERE copy_id = %s"
-        return self.db.execute_query(query, (status, copy_id))
+        return self.router.for_branch(branch).execute_query(query, (status, copy_id))
 
     def display_books(self):
-        """Display all books in a formatted table."""
+        """Display all books with copy counts summed over every branch."""
         query = """
-            SELECT b.book_id, b.title, b.isbn, b.publish_year, c.category_name, b.author,
-                   COUNT(bc.copy_id) as total_copies,
-                   SUM(CASE WHEN bc.available = 'yes' THEN 1 ELSE 0 END) as available_copies
+            SELECT b.book_id, b.title, b.isbn, b.publish_year, c.category_name, b.author
             FROM books b
             LEFT JOIN categories c ON b.category_id = c.category_id
-            LEFT JOIN book_copies bc ON b.book_id = bc.book_id
-            GROUP BY b.book_id
         """
-        results = self.db.fetch_all(query)
+        try:
+            books = self.router.fetch_catalog(query)
+        except ShardError as e:
+            print(f"Error generating book list: {e}")
+            return
+
+        query = """
+            SELECT book_id, COUNT(copy_id) as total_copies,
+                   SUM(CASE WHEN available = 'yes' THEN 1 ELSE 0 END) as available_copies
+            FROM book_copies
+            GROUP BY book_id
+        """
+        try:
+            rows = self.router.scatter_gather(query)
+        except ShardError as e:
+            print(f"Error generating book list: {e}")
+            return
+
+        copies = {}
+        for _, book_id, total, available in rows:
+            counts = copies.setdefault(book_id, [0, 0])
+            counts[0] += total
+            counts[1] += available
         
         table = PrettyTable()
         table.field_names = ["ID", "Title", "ISBN", "Year", "Category", "Author", "Total", "Available"]
-        table.add_rows(results)
+        table.add_rows([tuple(book) + tuple(copies.get(book[0], (0, 0))) for book in books])
         print(table)
 
     def display_overdue_books(self):
-        """Display all overdue books in a formatted table."""
+        """Display overdue books from every branch in a formatted table."""
         query = """
             SELECT t.transaction_id, b.title, m.name as member_name, t.borrow_date, t.due_date
             FROM transactions t
@@ -197,9 +262,13 @@ class LibraryService:
             JOIN membership m ON t.user_id = m.user_id
             WHERE t.return_date IS NULL AND t.due_date < CURDATE()
         """
-        results = self.db.fetch_all(query)
+        try:
+            results = self.router.scatter_gather(query)
+        except ShardError as e:
+            print(f"Error generating overdue report: {e}")
+            return
         
         table = PrettyTable()
-        table.field_names = ["Transaction ID", "Book", "Member", "Borrow Date", "Due Date"]
+        table.field_names = ["Branch", "Transaction ID", "Book", "Member", "Borrow Date", "Due Date"]
         table.add_rows(results)
         print(table) 
\ No newline at end of file
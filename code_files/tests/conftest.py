@@ -0,0 +1,107 @@
+"""
+Shared fixtures for the Library Management System tests.
+"""
+
+import os
+import sqlite3
+import sys
+from datetime import date, datetime
+
+import pytest
+from mysql.connector import Error
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+
+class SQLiteCursor:
+    """Cursor adapter that runs the MySQL-flavoured queries on SQLite."""
+
+    def __init__(self, connection):
+        self._cursor = connection.cursor()
+
+    def execute(self, query, params=None):
+        query = query.replace('%s', '?')
+        query = query.replace('INT PRIMARY KEY AUTO_INCREMENT', 'INTEGER PRIMARY KEY AUTOINCREMENT')
+        query = query.replace('CURDATE()', "date('now')")
+        params = tuple(
+            value.strftime('%Y-%m-%d') if isinstance(value, (date, datetime)) else value
+            for value in params or ()
+        )
+        try:
+            self._cursor.execute(query, params)
+        except sqlite3.Error as e:
+            raise Error(msg=str(e))
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """Connection adapter exposing the mysql.connector methods Database uses."""
+
+    def __init__(self, path):
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+
+    def cursor(self):
+        return SQLiteCursor(self._connection)
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        self._connection.close()
+
+
+class SQLiteDatabase(database.Database):
+    """Database backed by a local SQLite file named after the configured database."""
+
+    directory = None
+
+    def connect(self):
+        path = os.path.join(self.directory, f"{self.config['database']}.db")
+        self.connection = SQLiteConnection(path)
+        self.cursor = self.connection.cursor()
+
+
+@pytest.fixture
+def sqlite_databases(tmp_path, monkeypatch):
+    """Make every Database a SQLite file under a temporary directory."""
+    monkeypatch.setattr(SQLiteDatabase, 'directory', str(tmp_path))
+    monkeypatch.setattr(database, 'Database', SQLiteDatabase)
+    return tmp_path
+
+
+@pytest.fixture
+def shard_configs():
+    """Factory building shard configs for the given branch names."""
+    def build(*branches):
+        return {branch: {'database': f"library_{branch}"} for branch in branches}
+    return build
+
+
+@pytest.fixture
+def router(sqlite_databases, shard_configs):
+    """Router over three branch shards with the tables created."""
+    router = database.ShardRouter(shard_configs('north', 'south', 'east'), default_branch='north')
+    router.create_tables()
+    yield router
+    router.disconnect()
@@ -0,0 +1,205 @@
+"""
+Tests for branch-sharded routing in the Library Management System.
+"""
+
+import pytest
+
+import config
+from database import ShardRouter, ShardError
+from services import LibraryService
+
+
+@pytest.fixture
+def service(router):
+    """Library service with one category, book, member and librarian on every shard."""
+    service = LibraryService(router)
+    assert service.add_category("Fiction")
+    assert service.add_book("Dune", 1234567890, 1965, 1, "Frank Herbert")
+    assert service.register_member("Ann Lee", "ann@example.com", "9123456789", "1 Main St")
+    assert service.add_librarian("Bob Ray", "bob@example.com", "2020-01-01")
+    return service
+
+
+def count_rows(router, branch, table):
+    return router.for_branch(branch).fetch_one(f"SELECT COUNT(*) FROM {table}")[0]
+
+
+def test_for_branch_routes_to_branch_shard(router):
+    assert router.for_branch('south') is router.shards['south']
+    assert router.catalog() is router.shards['north']
+
+
+def test_for_branch_requires_branch_with_several_shards(router):
+    with pytest.raises(ValueError, match="A branch is required"):
+        router.for_branch()
+
+
+def test_for_branch_rejects_unknown_branch(router):
+    with pytest.raises(ValueError, match="Unknown branch: west"):
+        router.for_branch('west')
+
+
+def test_unconfigured_default_branch_is_rejected(sqlite_databases, shard_configs):
+    with pytest.raises(ValueError, match="Default branch 'nrth'"):
+        ShardRouter(shard_configs('north', 'south'), default_branch='nrth')
+
+
+def test_book_copies_stay_on_their_branch(service):
+    assert service.add_book_copy(1, "good", 'south')
+
+    assert count_rows(service.router, 'south', 'book_copies') == 1
+    assert count_rows(service.router, 'north', 'book_copies') == 0
+    assert count_rows(service.router, 'east', 'book_copies') == 0
+
+
+def test_per_branch_operation_without_branch_is_refused(service):
+    service.add_book_copy(1, "good", 'north')
+    service.borrow_book(1, 1, 1, 'north')
+
+    assert not service.add_book_copy(1, "good")
+    assert not service.borrow_book(1, 1, 1)
+    assert not service.return_book(1, 1)
+    with pytest.raises(ValueError):
+        service.is_book_available(1)
+
+    assert count_rows(service.router, 'north', 'book_copies') == 1
+    row = service.router.for_branch('north').fetch_one(
+        "SELECT return_date FROM transactions WHERE transaction_id = 1"
+    )
+    assert row == (None,)
+
+
+def test_replicated_rows_keep_catalog_id(router):
+    router.catalog().execute_query("INSERT INTO categories (category_name) VALUES ('Local')")
+
+    category_id = router.replicate_insert('categories', 'category_id', ('category_name',), ('Shared',))
+
+    assert category_id == 2
+    for branch in router.branches():
+        row = router.for_branch(branch).fetch_one(
+            "SELECT category_id FROM categories WHERE category_name = 'Shared'"
+        )
+        assert row == (2,)
+
+
+def test_failed_replica_rolls_back_written_shards(service, capsys):
+    east = service.router.for_branch('east')
+    east.execute_query(
+        "INSERT INTO books (book_id, title, isbn) VALUES (99, 'Clash', 9876543210)"
+    )
+
+    assert not service.add_book("Emma", 9876543210, 1815, 1, "Jane Austen")
+
+    for branch in ('north', 'south'):
+        assert count_rows(service.router, branch, 'books') == 1
+    assert "Error replicating books row 2 to branch 'east'" in capsys.readouterr().out
+
+    east.execute_query("DELETE FROM books WHERE book_id = 99")
+    assert service.add_book("Emma", 9876543210, 1815, 1, "Jane Austen")
+    for branch in service.router.branches():
+        assert count_rows(service.router, branch, 'books') == 2
+
+
+def test_display_books_sums_copies_across_branches(service, capsys):
+    service.add_book_copy(1, "good", 'north')
+    service.add_book_copy(1, "good", 'south')
+    service.add_book_copy(1, "worn", 'south')
+    service.borrow_book(1, 1, 1, 'south')
+    capsys.readouterr()
+
+    service.display_books()
+
+    row = [line for line in capsys.readouterr().out.splitlines() if "Dune" in line][0]
+    cells = [cell.strip() for cell in row.strip('|').split('|')]
+    assert cells[-2:] == ['3', '2']
+
+
+def test_display_books_reports_unreadable_catalog(service, capsys):
+    service.router.catalog().execute_query("DROP TABLE books")
+    capsys.readouterr()
+
+    service.display_books()
+
+    out = capsys.readouterr().out
+    assert "Error generating book list: Could not read from branch(es): north" in out
+    assert "Title" not in out
+
+
+def test_display_overdue_books_gathers_every_branch(service, capsys):
+    for branch in ('north', 'south'):
+        service.add_book_copy(1, "good", branch)
+        service.borrow_book(1, 1, 1, branch)
+    service.router.for_branch('south').execute_query(
+        "UPDATE transactions SET borrow_date = '2020-01-01', due_date = '2020-01-15'"
+    )
+    capsys.readouterr()
+
+    service.display_overdue_books()
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [cell.strip() for cell in lines[1].strip('|').split('|')][0] == "Branch"
+    rows = [[cell.strip() for cell in line.strip('|').split('|')]
+            for line in lines if "Dune" in line]
+    assert rows == [['south', '1', 'Dune', 'Ann Lee', '2020-01-01', '2020-01-15']]
+
+
+def test_return_book_only_updates_its_branch(service):
+    for branch in ('north', 'south'):
+        service.add_book_copy(1, "good", branch)
+        assert service.borrow_book(1, 1, 1, branch)
+
+    assert service.return_book(1, 1, 'south')
+
+    south = service.router.for_branch('south')
+    north = service.router.for_branch('north')
+    assert south.fetch_one("SELECT return_date FROM transactions WHERE transaction_id = 1")[0]
+    assert north.fetch_one("SELECT return_date FROM transactions WHERE transaction_id = 1") == (None,)
+    assert service.is_book_available(1, 'south')
+    assert not service.is_book_available(1, 'north')
+
+
+def test_can_user_borrow_counts_loans_on_every_branch(service):
+    for branch in ('north', 'south', 'east'):
+        service.add_book_copy(1, "good", branch)
+
+    assert service.borrow_book(1, 1, 1, 'north')
+    assert service.borrow_book(1, 1, 1, 'south')
+    assert service.can_user_borrow(1)
+    assert service.borrow_book(1, 1, 1, 'east')
+
+    assert not service.can_user_borrow(1)
+
+
+def test_unreadable_shard_refuses_loan(service, capsys):
+    service.add_book_copy(1, "good", 'north')
+    service.router.for_branch('east').execute_query("DROP TABLE transactions")
+
+    with pytest.raises(ShardError, match="east"):
+        service.can_user_borrow(1)
+    assert not service.borrow_book(1, 1, 1, 'north')
+    assert count_rows(service.router, 'north', 'transactions') == 0
+
+
+def test_single_database_fallback(sqlite_databases):
+    shard_configs = config.build_shard_configs([], 'main')
+
+    router = ShardRouter(shard_configs, default_branch='main')
+    router.create_tables()
+    service = LibraryService(router)
+
+    assert shard_configs == {'main': config.DB_CONFIG}
+    assert router.branches() == ['main']
+    assert service.db is router.for_branch()
+    assert service.add_category("Fiction")
+    assert service.add_book("Dune", 1234567890, 1965, 1, "Frank Herbert")
+    assert service.add_book_copy(1, "good")
+    assert count_rows(router, 'main', 'book_copies') == 1
+    router.disconnect()
+
+
+def test_branches_get_their_own_databases():
+    shard_configs = config.build_shard_configs(['north', 'south'], 'north')
+
+    assert list(shard_configs) == ['north', 'south']
+    assert shard_configs['south']['database'] == f"{config.DB_CONFIG['database']}_south"
+    assert shard_configs['south']['host'] == config.DB_CONFIG['host']